@@ -2,7 +2,7 @@
 DC Label Generator
 ==================
 
-Version 1.2.0 - Distribution Center Package Label Generator
+Version 1.3.0 - Distribution Center Package Label Generator
 
 Generates ZPL labels from Distru Packages and Products exports for Zebra printers.
 Supports filtering by Created Date, Brand, and Vendor with options for per-package
@@ -11,6 +11,19 @@ or per-case label generation.
 Label Format: 4" x 2" at 203 DPI (ZD621)
 
 CHANGELOG:
+v1.3.0 (2026-10-15)
+- ENHANCEMENT: Brand/Vendor filters apply together via an "Apply filters" button
+- ENHANCEMENT: Package table is paged (200 rows per page) for large exports
+- ENHANCEMENT: Label Overrides persist across page and filter changes until data is reprocessed
+- FIX: Override edits are no longer lost on alternate edits, and packages without a label no longer share one override
+- CHANGE: Empty Status/Brand/Vendor selections and "All Dates" now also show packages with no status, vendor or created date
+- CHANGE: A product listed twice in the Products export no longer duplicates its packages
+- CHANGE: Long product names always end in "..." on line 2; a single overlong word is cut at the label edge
+- FIX: Created timestamps in mixed formats are all parsed; the label date and week symbol always agree
+- ENHANCEMENT: Reprocessing the same files reuses the previous result
+- ENHANCEMENT: Faster label generation and filtering on large exports
+- UI: Download filenames use Pacific time; CSV export includes the printed Label Date
+
 v1.2.0 (2025-02-21)
 - FEATURE: Added Package Search - search/filter by Package Label for quick single-label printing
 - ENHANCEMENT: Streamlined label generation - single-click Generate & Download ZPL
@@ -71,10 +84,16 @@ Author: DC Retail
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import io
 import math
 import base64
-from datetime import datetime, timedelta
+import hashlib
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import repeat
+from types import MappingProxyType
 from typing import Optional, Tuple, List
 import streamlit.components.v1 as components
 from zoneinfo import ZoneInfo
@@ -84,7 +103,12 @@ from zoneinfo import ZoneInfo
 # CONFIGURATION CONSTANTS
 # =============================================================================
 
-VERSION = "1.2.0"
+VERSION = "1.3.0"
+
+# Copy-on-write lets column selections share data instead of duplicating it.
+# It is always on from pandas 3, where setting the option is deprecated.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.options.mode.copy_on_write = True
 
 # Timezone - always use Pacific time for date filtering
 TIMEZONE = ZoneInfo("America/Los_Angeles")
@@ -94,6 +118,35 @@ LABEL_WIDTH = 4.0    # inches
 LABEL_HEIGHT = 2.0   # inches
 DPI = 203            # dots per inch
 
+# CSV columns actually used downstream; anything else is skipped at parse time
+PACKAGES_COLUMNS = (
+    "Distru Product", "Package Label", "Quantity", "Distru Batch Number",
+    "Created in Distru At (UTC)", "Status", "Location", "Category"
+)
+PRODUCTS_COLUMNS = ("Name", "Units Per Case", "Category", "Vendor")
+
+# Label layout in dots (fixed for the 4" x 2" label)
+FONT_UID = 46
+FONT_LARGE = 32
+FONT_LARGE_PLUS = 28
+FONT_MEDIUM = 24
+FONT_SMALL_PLUS = 22
+
+LEFT_MARGIN = 20
+RIGHT_MARGIN = 20
+
+BRAND_BAR_Y = 8
+BRAND_BAR_HEIGHT = 50
+PRODUCT_Y = 70
+UID_Y = 180
+DATE_Y = 220
+BOTTOM_Y = 360
+QR_Y = 120
+QR_MAGNIFICATION = 5
+
+# Rows shown per page in the package editor
+EDITOR_PAGE_SIZE = 200
+
 # Week symbol configuration
 WEEK_SYMBOL_SIZE = 40  # Size in dots (40x40 pixels)
 
@@ -246,6 +299,29 @@ WEEK_ICONS = {
     },
 }
 
+# Precomputed "^GFA,...^FS" tails and names indexed by week_num - 1. Built once
+# at import so each label only needs a list index instead of four dict lookups.
+# Icon data is validated here, so a bad entry fails at startup, not at print time.
+# Short hex is padded with blank (zero) bytes, matching what the printer does.
+_WEEK_TAIL = [None] * 18
+WEEK_ICON_NAMES = [None] * 18
+for _week, _icon in WEEK_ICONS.items():
+    if _icon["total_bytes"] != _icon["bytes_per_row"] * _icon["height"]:
+        raise ValueError(f"Week {_week} icon total_bytes does not match bytes_per_row * height")
+    if len(_icon["hex"]) > _icon["total_bytes"] * 2:
+        raise ValueError(f"Week {_week} icon hex data exceeds total_bytes")
+    _hex = _icon["hex"].ljust(_icon["total_bytes"] * 2, "0")
+    WEEK_ICON_NAMES[_week - 1] = _icon["name"]
+    _WEEK_TAIL[_week - 1] = (
+        f"^GFA,{_icon['total_bytes']},{_icon['total_bytes']},"
+        f"{_icon['bytes_per_row']},{_hex}^FS"
+    )
+_WEEK_TAIL = tuple(_WEEK_TAIL)
+WEEK_ICON_NAMES = tuple(WEEK_ICON_NAMES)
+
+# The icon registry is read-only after validation
+WEEK_ICONS = MappingProxyType({week: MappingProxyType(icon) for week, icon in WEEK_ICONS.items()})
+
 
 # =============================================================================
 # PAGE SETUP
@@ -265,10 +341,11 @@ st.set_page_config(
 def initialize_session_state():
     """Initialize all session state variables used by the application."""
     defaults = {
-        "processed_data": None,
-        "products_data": None,
-        "packages_data": None,
+        "data_key": None,  # Key of the current processed frame in _processed_store()
         "date_selection": "today",  # Default to today
+        "label_overrides": {},  # Processed frame row index -> Label Override count
+        "override_epoch": 0,  # Bumped on Process Data so override editors start fresh
+        "available_dates": None,  # Sorted unique Created Dates of the processed frame
         "zpl_content": None,
         "zpl_filename": None,
         "label_count": 0
@@ -306,6 +383,15 @@ def safe_numeric(value, default=0.0):
         return default
 
 
+def vec_numeric(series, default=0.0):
+    """
+    Vectorized counterpart of safe_numeric for whole columns.
+    
+    Blank, NaN and unparseable values become the default.
+    """
+    return pd.to_numeric(series.astype(str).str.strip(), errors="coerce").fillna(default)
+
+
 def extract_brand(product_name):
     """
     Extract brand and product name from a full product string.
@@ -314,24 +400,38 @@ def extract_brand(product_name):
     if pd.isna(product_name) or not product_name:
         return ("", str(product_name) if product_name else "")
     
-    product_str = str(product_name).strip()
+    return _extract_brand_cached(str(product_name))
+
+
+@lru_cache(maxsize=4096)
+def _extract_brand_cached(product_name):
+    """Split a non-empty product string; memoized since names repeat per package."""
+    product_str = product_name.strip()
     
-    if " - " in product_str:
-        parts = product_str.split(" - ", 1)
-        return (parts[0].strip(), parts[1].strip())
+    head, sep, tail = product_str.partition(" - ")
+    if sep:
+        return (head.strip(), tail.strip())
     
-    if "-" in product_str:
-        parts = product_str.split("-", 1)
-        return (parts[0].strip(), parts[1].strip())
+    head, sep, tail = product_str.partition("-")
+    if sep:
+        return (head.strip(), tail.strip())
     
     return ("", product_str)
 
 
-def load_csv(uploaded_file, file_type):
-    """Load a CSV file into a DataFrame with all columns as strings."""
+def load_csv(uploaded_file, file_type, usecols=None):
+    """
+    Load a CSV file into a DataFrame with all columns as strings.
+    
+    If usecols is given, only those columns are parsed. Columns missing from
+    the file are ignored here so an unexpected header set still loads.
+    """
     try:
         uploaded_file.seek(0)
-        df = pd.read_csv(uploaded_file, dtype=str)
+        if usecols is not None:
+            wanted = set(usecols)
+            usecols = lambda col: col in wanted
+        df = pd.read_csv(uploaded_file, dtype=str, engine="c", usecols=usecols)
         if df.empty:
             return None
         return df
@@ -340,11 +440,48 @@ def load_csv(uploaded_file, file_type):
         return None
 
 
+def upload_key(*uploaded_files):
+    """
+    Content hash of the uploaded files, used as the processed data_key.
+    
+    The current date is mixed in because packages without a created date
+    fall back to the current week when merged.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(datetime.now(TIMEZONE).date().isoformat().encode())
+    for uploaded_file in uploaded_files:
+        content = uploaded_file.getvalue()
+        digest.update(len(content).to_bytes(8, "little"))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def dates_in_range(sorted_dates, start, end=None):
+    """
+    Dates from a sorted array falling within [start, end], as a list.
+    
+    Uses binary search on the pre-sorted available dates; end=None leaves
+    the range open.
+    """
+    lo = np.searchsorted(sorted_dates, start, side="left")
+    hi = len(sorted_dates) if end is None else np.searchsorted(sorted_dates, end, side="right")
+    return sorted_dates[lo:hi].tolist()
+
+
+# ZPL command prefixes (^, ~) would end the field early, so they are dropped
+_QR_SANITIZE = str.maketrans("", "", "^~")
+
+
 def sanitize_qr_data(package_label):
     """Clean and validate package label for QR code generation."""
     if pd.isna(package_label) or package_label is None:
         return ""
-    return str(package_label).strip()
+    return str(package_label).strip().translate(_QR_SANITIZE)
+
+
+def sanitize_qr_series(series):
+    """Vectorized sanitize_qr_data for a whole Package Label column."""
+    return series.fillna("").astype(str).str.strip().str.translate(_QR_SANITIZE)
 
 
 def calculate_case_labels_needed(quantity, units_per_case):
@@ -390,87 +527,121 @@ def get_week_number(date_value=None):
         else:
             date_obj = datetime.now(TIMEZONE)
         
-        iso_week = date_obj.isocalendar()[1]
-        return ((iso_week - 1) % 18) + 1
+        return _week_number_for_ordinal(date_obj.toordinal())
     except (ValueError, TypeError):
         return 1
 
 
+@lru_cache(maxsize=1024)
+def _week_number_for_ordinal(ordinal):
+    """Week number (1-18) for a proleptic Gregorian ordinal day."""
+    iso_week = date.fromordinal(ordinal).isocalendar()[1]
+    return ((iso_week - 1) % 18) + 1
+
+
 def get_week_icon_name(week_num):
     """Get the icon name for a given week number."""
-    week_num = ((week_num - 1) % 18) + 1
-    return WEEK_ICONS.get(week_num, {}).get("name", "unknown")
+    return WEEK_ICON_NAMES[(week_num - 1) % 18]
 
 
 def generate_week_symbol_zpl(week_num, x, y):
     """Generate ZPL commands to draw the weekly symbol at specified position."""
-    week_num = ((week_num - 1) % 18) + 1
-    
-    icon = WEEK_ICONS.get(week_num)
-    if not icon:
-        return ""
-    
-    zpl = f"^FO{x},{y}^GFA,{icon['total_bytes']},{icon['total_bytes']},{icon['bytes_per_row']},{icon['hex']}^FS"
-    return zpl
+    return f"^FO{x},{y}" + _WEEK_TAIL[(week_num - 1) % 18]
 
 
 # =============================================================================
 # DATA PROCESSING
 # =============================================================================
 
+def parse_created_at(series):
+    """
+    Parse Distru created timestamps to UTC; unparseable values become NaT.
+    
+    format="mixed" parses each value on its own, so rows whose format
+    differs from the first row (e.g. fractional seconds) are not lost.
+    """
+    return pd.to_datetime(series, utc=True, format="mixed", errors="coerce")
+
+
+def format_created_dates(series, parsed):
+    """
+    MM/DD/YYYY label dates for a created timestamp column.
+    
+    parsed is parse_created_at(series). Unparseable values keep their raw
+    text and missing ones become "", as in _format_created_date.
+    """
+    raw = series.fillna("").astype(str)
+    return parsed.dt.strftime("%m/%d/%Y").where(parsed.notna(), raw)
+
+
 def merge_data_sources(packages_df, products_df):
     """Merge Packages and Products data to create the working dataset."""
     try:
-        st.session_state.packages_data = packages_df
-        st.session_state.products_data = products_df
-        
-        products_subset = products_df[["Name", "Units Per Case", "Category", "Vendor"]].copy()
-        products_subset = products_subset.rename(columns={"Category": "Product_Category"})
-        
-        merged_df = packages_df.merge(
-            products_subset,
-            left_on="Distru Product",
-            right_on="Name",
-            how="left",
-            suffixes=("", "_products")
+        # Index products by name so the lookup is a single indexed join
+        products_subset = (
+            products_df[["Name", "Units Per Case", "Category", "Vendor"]]
+            .rename(columns={"Category": "Product_Category"})
+            .drop_duplicates("Name")
+            .set_index("Name")
         )
         
+        merged_df = packages_df.join(products_subset, on="Distru Product", how="left")
+        
         merged_df["Brand"] = merged_df["Distru Product"].apply(lambda x: extract_brand(x)[0])
         merged_df["Product_Name_Clean"] = merged_df["Distru Product"].apply(lambda x: extract_brand(x)[1])
         
-        merged_df["Created_Date"] = pd.to_datetime(
-            merged_df["Created in Distru At (UTC)"],
-            errors="coerce"
-        ).dt.date
+        # Parse timestamps once; the date, label date and week symbol all derive from it
+        created_dt = parse_created_at(merged_df["Created in Distru At (UTC)"])
+        merged_df["Created_Date"] = created_dt.dt.date
+        merged_df["Label_Date"] = format_created_dates(merged_df["Created in Distru At (UTC)"], created_dt)
+        # As in get_week_number: a missing timestamp takes the current week,
+        # one that is present but unparseable takes week 1
+        iso_week = created_dt.dt.isocalendar().week
+        merged_df["Week_Num"] = (
+            ((iso_week - 1) % 18 + 1)
+            .fillna(1)
+            .mask(merged_df["Created in Distru At (UTC)"].isna(), get_week_number())
+            .astype("int8")
+        )
+        
+        merged_df["Quantity_Num"] = vec_numeric(merged_df["Quantity"])
+        merged_df["Units_Per_Case_Num"] = vec_numeric(merged_df["Units Per Case"])
         
-        merged_df["Quantity_Num"] = merged_df["Quantity"].apply(safe_numeric)
-        merged_df["Units_Per_Case_Num"] = merged_df["Units Per Case"].apply(safe_numeric)
+        # Vectorized calculate_case_labels_needed: ceil(qty / units), 0 when either is <= 0
+        qty = merged_df["Quantity_Num"].to_numpy(dtype=np.float64)
+        units = merged_df["Units_Per_Case_Num"].to_numpy(dtype=np.float64)
+        has_cases = (units > 0) & (qty > 0)
+        case_labels = np.zeros(len(qty), dtype=np.int64)
+        case_labels[has_cases] = np.ceil(qty[has_cases] / units[has_cases]).astype(np.int64)
+        merged_df["Case_Labels_Needed"] = case_labels
         
-        merged_df["Case_Labels_Needed"] = merged_df.apply(
-            lambda row: calculate_case_labels_needed(
-                row["Quantity_Num"],
-                row["Units_Per_Case_Num"]
-            ) if row["Units_Per_Case_Num"] > 0 else 0,
-            axis=1
-        )
+        merged_df["Package Label"] = sanitize_qr_series(merged_df["Package Label"])
         
-        merged_df["Display_Category"] = merged_df["Category"].fillna(merged_df["Product_Category"])
+        package_category = merged_df["Category"].to_numpy()
+        merged_df["Display_Category"] = np.where(
+            pd.isna(package_category),
+            merged_df["Product_Category"].to_numpy(),
+            package_category
+        )
         
         result_df = merged_df[[
             "Distru Product", "Brand", "Product_Name_Clean", "Package Label",
             "Quantity", "Quantity_Num", "Units Per Case", "Units_Per_Case_Num",
             "Case_Labels_Needed", "Distru Batch Number", "Display_Category",
-            "Created_Date", "Created in Distru At (UTC)", "Status", "Location", "Vendor"
-        ]].copy()
+            "Created_Date", "Created in Distru At (UTC)", "Label_Date", "Week_Num",
+            "Status", "Location", "Vendor"
+        ]]
         
         result_df.columns = [
             "Product Name", "Brand", "Product (Clean)", "Package Label",
             "Quantity", "Quantity_Num", "Units Per Case", "Units_Per_Case_Num",
             "Case Labels Needed", "Batch No", "Category",
-            "Created Date", "Created At (Full)", "Status", "Location", "Vendor"
+            "Created Date", "Created At (Full)", "Label Date", "Week Num",
+            "Status", "Location", "Vendor"
         ]
         
-        return result_df
+        # Low-cardinality filter columns: categorical codes make isin/unique cheap
+        return result_df.astype({"Brand": "category", "Vendor": "category", "Status": "category"})
         
     except Exception as e:
         st.error(f"Error processing data: {str(e)}")
@@ -483,7 +654,128 @@ def merge_data_sources(packages_df, products_df):
 # ZPL LABEL GENERATION
 # =============================================================================
 
-def generate_label_zpl(product_name, brand, product_clean, batch_no, qty, package_label, category, created_date):
+# Derived label geometry; the label size never changes at runtime
+_WIDTH_DOTS = int(LABEL_WIDTH * DPI)
+_QR_X = _WIDTH_DOTS - QR_MAGNIFICATION * 30 - 15
+_MAX_CHARS = int((_WIDTH_DOTS - LEFT_MARGIN - RIGHT_MARGIN) / (FONT_LARGE * 0.45))
+_UID_AREA_WIDTH = _QR_X - LEFT_MARGIN - 20  # UID and date are centered left of the QR
+_BRAND_TEXT_Y = BRAND_BAR_Y + (BRAND_BAR_HEIGHT - FONT_LARGE) // 2
+_CATEGORY_TEXT_Y = BRAND_BAR_Y + (BRAND_BAR_HEIGHT - FONT_MEDIUM) // 2
+_LINE2_Y = PRODUCT_Y + int(FONT_LARGE * 1.2)
+_SYMBOL_X = (_WIDTH_DOTS // 2) - (WEEK_SYMBOL_SIZE // 2)
+_SYMBOL_Y = BOTTOM_Y - 4
+
+_BRAND_BAR_ZPL = f"^FO0,{BRAND_BAR_Y}^GB{_WIDTH_DOTS},{BRAND_BAR_HEIGHT},{BRAND_BAR_HEIGHT}^FS"
+_CF_UID = f"^CF0,{FONT_UID}"
+_CF_LARGE = f"^CF0,{FONT_LARGE}"
+_CF_LARGE_PLUS = f"^CF0,{FONT_LARGE_PLUS}"
+_CF_MEDIUM = f"^CF0,{FONT_MEDIUM}"
+_CF_SMALL_PLUS = f"^CF0,{FONT_SMALL_PLUS}"
+
+# Optional label fields; a bitmask of the ones present selects the ZPL template
+_FIELD_BRAND = 1
+_FIELD_CATEGORY = 2
+_FIELD_SECOND_LINE = 4
+_FIELD_UID = 8
+_FIELD_DATE = 16
+_FIELD_BATCH = 32
+
+_LABEL_TEMPLATES = {}
+
+
+def _label_template(fields):
+    """
+    Return the ZPL template for a bitmask of optional fields.
+    
+    Templates are assembled once per combination and cached. All fixed
+    geometry is baked in; only label text and the x positions that depend
+    on text length are left as format_map placeholders.
+    """
+    template = _LABEL_TEMPLATES.get(fields)
+    if template is not None:
+        return template
+    
+    zpl = ["^XA"]
+    
+    # Black brand bar
+    zpl.append(_BRAND_BAR_ZPL)
+    
+    if fields & _FIELD_BRAND:
+        zpl.append("^FR")
+        zpl.append(_CF_LARGE)
+        zpl.append(f"^FO{LEFT_MARGIN},{_BRAND_TEXT_Y}^FR^FD{{brand}}^FS")
+    
+    if fields & _FIELD_CATEGORY:
+        zpl.append(_CF_MEDIUM)
+        zpl.append(f"^FO{{category_x}},{_CATEGORY_TEXT_Y}^FR^FD{{category}}^FS")
+    
+    # Product name
+    zpl.append(_CF_LARGE)
+    zpl.append(f"^FO{LEFT_MARGIN},{PRODUCT_Y}^FD{{line1}}^FS")
+    if fields & _FIELD_SECOND_LINE:
+        zpl.append(f"^FO{LEFT_MARGIN},{_LINE2_Y}^FD{{line2}}^FS")
+    
+    # UID
+    if fields & _FIELD_UID:
+        zpl.append(_CF_UID)
+        zpl.append(f"^FO{{uid_x}},{UID_Y}^FD{{qr_data}}^FS")
+    
+    # Created date
+    if fields & _FIELD_DATE:
+        zpl.append(_CF_SMALL_PLUS)
+        zpl.append(f"^FO{{date_x}},{DATE_Y}^FD{{date_text}}^FS")
+    
+    # QR code
+    if fields & _FIELD_UID:
+        zpl.append(f"^FO{_QR_X},{QR_Y}^BQN,2,{QR_MAGNIFICATION}^FDQA,{{qr_data}}^FS")
+    
+    # Batch number
+    if fields & _FIELD_BATCH:
+        zpl.append(_CF_LARGE_PLUS)
+        zpl.append(f"^FO{LEFT_MARGIN},{BOTTOM_Y}^FDBatch: {{batch}}^FS")
+    
+    # Week symbol and case quantity
+    zpl.append("{week_symbol}")
+    zpl.append(_CF_LARGE_PLUS)
+    zpl.append(f"^FO{{qty_x}},{BOTTOM_Y}^FD{{qty}}^FS")
+    
+    zpl.append("^XZ")
+    
+    template = _LABEL_TEMPLATES[fields] = "\n".join(zpl)
+    return template
+
+
+def _ell(text, max_len):
+    """Truncate text to max_len characters, ending in "..." when cut."""
+    return text if len(text) <= max_len else f"{text[:max_len - 3]}..."
+
+
+def _format_qty(qty):
+    """Format the case quantity text for any value (see _QTY_DISPLAY_LUT)."""
+    if qty is None:
+        return "Case Qty: N/A"
+    qty_num = safe_numeric(qty, 0)
+    if qty_num == int(qty_num):
+        return f"Case Qty: {int(qty_num)}"
+    return f"Case Qty: {qty_num:.1f}"
+
+
+# Precomputed case quantity text for the common values
+_QTY_DISPLAY_LUT = {i: f"Case Qty: {i}" for i in range(256)}
+_QTY_DISPLAY_LUT[None] = "Case Qty: N/A"
+
+
+def _format_created_date(created_date):
+    """Format a created timestamp as MM/DD/YYYY for the label ("" if missing)."""
+    if pd.notna(created_date) and created_date:
+        try:
+            return pd.to_datetime(created_date, utc=True).strftime("%m/%d/%Y")
+        except (ValueError, TypeError):
+            return str(created_date)
+    return ""
+
+
+def generate_label_zpl(product_name, brand, product_clean, batch_no, qty, package_label, category, created_date_display, week_num):
     """
     Generate ZPL code for a single 4" x 2" label at 203 DPI.
     
@@ -498,259 +790,267 @@ def generate_label_zpl(product_name, brand, product_clean, batch_no, qty, packag
     |                                                      +---+|
     | Batch: ABC-123    [ICON]                    Case Qty: 25  |
     +-----------------------------------------------------------+
-    """
-    width_dots = int(LABEL_WIDTH * DPI)
-    
-    font_uid = 46
-    font_large = 32
-    font_large_plus = 28
-    font_medium = 24
-    font_small_plus = 22
-    
-    left_margin = 20
-    right_margin = 20
-    
-    brand_bar_y = 8
-    brand_bar_height = 50
-    product_y = 70
-    uid_y = 180
-    date_y = 220
-    bottom_y = 360
-    qr_y = 120
-    
-    qr_magnification = 5
-    qr_box_size = qr_magnification * 30
-    qr_x = width_dots - qr_box_size - 15
-    
-    text_width = width_dots - left_margin - right_margin
-    max_chars = int(text_width / (font_large * 0.45))
-    
-    brand_display = str(brand) if pd.notna(brand) and brand else ""
-    if len(brand_display) > max_chars:
-        brand_display = brand_display[:max_chars - 3] + "..."
-    
-    if pd.notna(product_clean) and product_clean:
-        product_display = str(product_clean)
-    else:
-        product_display = str(product_name)
     
-    product_lines = []
+    Text arguments are strings with "" (or None) for missing values; NaN
+    is normalized away by _label_fields / _label_field_rows beforehand.
+    created_date_display is the preformatted "Label Date" and week_num the
+    symbol week, both computed once per package by callers.
+    """
+    brand_display = _ell(brand, _MAX_CHARS) if brand else ""
+    product_display = product_clean or product_name or ""
     
-    if len(product_display) > max_chars:
-        words = product_display.split()
-        current_line = ""
-        
-        for word in words:
-            if current_line:
-                test_line = current_line + " " + word
-            else:
-                test_line = word
-            
-            if len(test_line) <= max_chars:
-                current_line = test_line
-            else:
-                if current_line:
-                    product_lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            product_lines.append(current_line)
-        
-        if len(product_lines) > 2:
-            product_lines = product_lines[:2]
-            if len(product_lines[1]) > max_chars - 3:
-                product_lines[1] = product_lines[1][:max_chars - 3] + "..."
-    else:
+    # Wrap to at most 2 lines: break at the last space that fits, else hard-cut
+    if len(product_display) <= _MAX_CHARS:
         product_lines = [product_display]
+    else:
+        cut = product_display.rfind(" ", 0, _MAX_CHARS + 1)
+        if cut > 0:
+            line1, rest = product_display[:cut], product_display[cut + 1:]
+        else:
+            line1, rest = product_display[:_MAX_CHARS], product_display[_MAX_CHARS:]
+        product_lines = [line1, _ell(rest, _MAX_CHARS)]
     
     qr_data = sanitize_qr_data(package_label)
     
-    created_date_display = ""
-    if pd.notna(created_date) and created_date:
-        try:
-            date_obj = pd.to_datetime(created_date)
-            created_date_display = date_obj.strftime("%m/%d/%Y")
-        except (ValueError, TypeError):
-            created_date_display = str(created_date)
-    
-    week_num = get_week_number(created_date)
+    # Case quantity (small whole numbers, including floats like 12.0, hit the table)
+    qty_display = _QTY_DISPLAY_LUT.get(qty) or _format_qty(qty)
     
-    zpl = []
-    zpl.append("^XA")
-    
-    # Black brand bar
-    zpl.append(f"^FO0,{brand_bar_y}^GB{width_dots},{brand_bar_height},{brand_bar_height}^FS")
+    fields = 0
+    values = {
+        "line1": product_lines[0] if product_lines else "",
+        "week_symbol": generate_week_symbol_zpl(week_num, _SYMBOL_X, _SYMBOL_Y),
+        "qty": qty_display,
+        "qty_x": _WIDTH_DOTS - RIGHT_MARGIN - len(qty_display) * (FONT_LARGE_PLUS // 2),
+    }
     
-    brand_text_y = brand_bar_y + (brand_bar_height - font_large) // 2
     if brand_display:
-        zpl.append("^FR")
-        zpl.append(f"^CF0,{font_large}")
-        zpl.append(f"^FO{left_margin},{brand_text_y}^FR^FD{brand_display}^FS")
+        fields |= _FIELD_BRAND
+        values["brand"] = brand_display
     
-    if pd.notna(category) and category:
-        category_text = str(category)
-        category_width = len(category_text) * (font_medium // 2)
-        category_x = width_dots - right_margin - category_width
-        category_text_y = brand_bar_y + (brand_bar_height - font_medium) // 2
-        zpl.append(f"^CF0,{font_medium}")
-        zpl.append(f"^FO{category_x},{category_text_y}^FR^FD{category_text}^FS")
+    if category:
+        fields |= _FIELD_CATEGORY
+        values["category"] = category
+        values["category_x"] = _WIDTH_DOTS - RIGHT_MARGIN - len(category) * (FONT_MEDIUM // 2)
     
-    # Product name
-    zpl.append(f"^CF0,{font_large}")
-    current_y = product_y
-    for line in product_lines:
-        zpl.append(f"^FO{left_margin},{current_y}^FD{line}^FS")
-        current_y += int(font_large * 1.2)
+    if len(product_lines) > 1:
+        fields |= _FIELD_SECOND_LINE
+        values["line2"] = product_lines[1]
     
-    # UID
     if qr_data:
-        uid_width = len(qr_data) * (font_uid // 2)
-        available_width = qr_x - left_margin - 20
-        uid_x = left_margin + (available_width - uid_width) // 2
-        if uid_x < left_margin:
-            uid_x = left_margin
-        zpl.append(f"^CF0,{font_uid}")
-        zpl.append(f"^FO{uid_x},{uid_y}^FD{qr_data}^FS")
+        fields |= _FIELD_UID
+        values["qr_data"] = qr_data
+        uid_width = len(qr_data) * (FONT_UID // 2)
+        values["uid_x"] = max(LEFT_MARGIN + (_UID_AREA_WIDTH - uid_width) // 2, LEFT_MARGIN)
     
-    # Created date
     if created_date_display:
         date_text = f"Created: {created_date_display}"
-        date_width = len(date_text) * (font_small_plus // 2)
-        available_width = qr_x - left_margin - 20
-        date_x = left_margin + (available_width - date_width) // 2
-        if date_x < left_margin:
-            date_x = left_margin
-        zpl.append(f"^CF0,{font_small_plus}")
-        zpl.append(f"^FO{date_x},{date_y}^FD{date_text}^FS")
-    
-    # QR code
-    if qr_data:
-        zpl.append(f"^FO{qr_x},{qr_y}^BQN,2,{qr_magnification}^FDQA,{qr_data}^FS")
-    
-    # Batch number
-    if pd.notna(batch_no) and batch_no:
-        batch_display = str(batch_no)
-        zpl.append(f"^CF0,{font_large_plus}")
-        zpl.append(f"^FO{left_margin},{bottom_y}^FDBatch: {batch_display}^FS")
-    
-    # Week symbol
-    symbol_x = (width_dots // 2) - (WEEK_SYMBOL_SIZE // 2)
-    symbol_y = bottom_y - 4
-    week_symbol_zpl = generate_week_symbol_zpl(week_num, symbol_x, symbol_y)
-    if week_symbol_zpl:
-        zpl.append(week_symbol_zpl)
-    
-    # Case quantity
-    if qty is not None:
-        qty_num = safe_numeric(qty, 0)
-        if qty_num == int(qty_num):
-            qty_display = f"Case Qty: {int(qty_num)}"
-        else:
-            qty_display = f"Case Qty: {qty_num:.1f}"
-    else:
-        qty_display = "Case Qty: N/A"
+        fields |= _FIELD_DATE
+        values["date_text"] = date_text
+        date_width = len(date_text) * (FONT_SMALL_PLUS // 2)
+        values["date_x"] = max(LEFT_MARGIN + (_UID_AREA_WIDTH - date_width) // 2, LEFT_MARGIN)
     
-    qty_width = len(qty_display) * (font_large_plus // 2)
-    qty_x = width_dots - right_margin - qty_width
-    zpl.append(f"^CF0,{font_large_plus}")
-    zpl.append(f"^FO{qty_x},{bottom_y}^FD{qty_display}^FS")
+    if batch_no:
+        fields |= _FIELD_BATCH
+        values["batch"] = batch_no
     
-    zpl.append("^XZ")
+    return _label_template(fields).format_map(values)
+
+
+def _text(value):
+    """Normalize a label text value: NaN/None become ""."""
+    return "" if value is None or pd.isna(value) else str(value)
+
+
+# Row columns that feed generate_label_zpl, in _label_fields argument order
+_LABEL_FIELD_COLUMNS = (
+    "Product Name", "Brand", "Product (Clean)", "Batch No",
+    "Package Label", "Category", "Created At (Full)", "Week Num", "Label Date"
+)
+
+
+def _label_fields(product_name, brand, product_clean, batch_no, package_label, category, created_date, week_num, date_display=None):
+    """
+    Normalize one package's label values into a hashable tuple.
     
-    return "\n".join(zpl)
+    date_display and week_num normally come precomputed from
+    merge_data_sources; they are derived from created_date here, once per
+    package, only when missing.
+    """
+    if week_num is None or pd.isna(week_num):
+        week_num = get_week_number(created_date)
+    if date_display is None or pd.isna(date_display):
+        date_display = _format_created_date(created_date)
+    return (
+        _text(product_name),
+        _text(brand),
+        _text(product_clean),
+        _text(batch_no),
+        _text(package_label),
+        _text(category),
+        str(date_display),
+        int(week_num)
+    )
 
 
-def generate_labels_for_row(row, label_mode):
-    """Generate all labels needed for a single package row."""
-    labels = []
+def _label_field_rows(df_sorted):
+    """
+    Build the _label_fields tuple for every row with column-wide operations.
+    
+    Label dates and weeks are read from the columns merge_data_sources
+    precomputes; null normalization runs once over each column instead of
+    once per row. Rendering still goes through the cached templates.
+    """
+    row_count = len(df_sorted)
     
-    quantity = safe_numeric(row.get("Quantity_Num", 0))
-    units_per_case = safe_numeric(row.get("Units_Per_Case_Num", 0))
-    created_date = row.get("Created At (Full)", "")
+    def text(name):
+        if name not in df_sorted.columns:
+            return [""] * row_count
+        return df_sorted[name].astype(object).fillna("").astype(str).to_numpy(dtype=object)
     
+    if "Created At (Full)" in df_sorted.columns:
+        created = df_sorted["Created At (Full)"]
+    else:
+        created = [None] * row_count
+    
+    if "Label Date" in df_sorted.columns:
+        dates = text("Label Date")
+    elif "Created At (Full)" in df_sorted.columns:
+        dates = format_created_dates(created, parse_created_at(created)).to_numpy(dtype=object)
+    else:
+        dates = [""] * row_count
+    
+    if "Week Num" in df_sorted.columns:
+        weeks = df_sorted["Week Num"].astype(int).tolist()
+    else:
+        weeks = [get_week_number(value) for value in created]
+    
+    return zip(
+        text("Product Name"),
+        text("Brand"),
+        text("Product (Clean)"),
+        text("Batch No"),
+        text("Package Label"),
+        text("Category"),
+        dates,
+        weeks
+    )
+
+
+@lru_cache(maxsize=4096)
+def _generate_label_zpl_cached(qty, product_name, brand, product_clean, batch_no, package_label, category, created_date_display, week_num):
+    """Memoized generate_label_zpl; every argument must be a hashable scalar."""
+    return generate_label_zpl(
+        product_name=product_name,
+        brand=brand,
+        product_clean=product_clean,
+        batch_no=batch_no,
+        qty=qty,
+        package_label=package_label,
+        category=category,
+        created_date_display=created_date_display,
+        week_num=week_num
+    )
+
+
+def _labels_for_package(fields, quantity, units_per_case, label_mode):
+    """Generate the labels for one package from its _label_fields tuple."""
     if quantity <= 0:
         return []
     
-    units_per_case_display = units_per_case if units_per_case > 0 else None
-    
     if label_mode == "package":
-        zpl = generate_label_zpl(
-            product_name=row.get("Product Name", ""),
-            brand=row.get("Brand", ""),
-            product_clean=row.get("Product (Clean)", ""),
-            batch_no=row.get("Batch No", ""),
-            qty=units_per_case_display,
-            package_label=row.get("Package Label", ""),
-            category=row.get("Category", ""),
-            created_date=created_date
-        )
-        labels.append(zpl)
+        units_per_case_display = units_per_case if units_per_case > 0 else None
+        return [_generate_label_zpl_cached(units_per_case_display, *fields)]
     
-    elif label_mode == "case" and units_per_case > 0:
+    if label_mode == "case" and units_per_case > 0:
         num_cases = calculate_case_labels_needed(quantity, units_per_case)
-        
-        for _ in range(num_cases):
-            zpl = generate_label_zpl(
-                product_name=row.get("Product Name", ""),
-                brand=row.get("Brand", ""),
-                product_clean=row.get("Product (Clean)", ""),
-                batch_no=row.get("Batch No", ""),
-                qty=units_per_case,
-                package_label=row.get("Package Label", ""),
-                category=row.get("Category", ""),
-                created_date=created_date
-            )
-            labels.append(zpl)
-    
-    return labels
+        return [_generate_label_zpl_cached(units_per_case, *fields)] * num_cases
+    
+    return []
 
 
-def generate_all_labels(df, label_mode):
+def generate_labels_for_row(row, label_mode):
     """
-    Generate labels for all rows in the DataFrame, sorted by UID.
+    Generate all labels needed for a single package row.
+    
+    row may be a pandas Series or a plain dict of column values.
+    """
+    return _labels_for_package(
+        _label_fields(*(row.get(col) for col in _LABEL_FIELD_COLUMNS)),
+        safe_numeric(row.get("Quantity_Num", 0)),
+        safe_numeric(row.get("Units_Per_Case_Num", 0)),
+        label_mode
+    )
+
+
+def _sort_by_uid(df):
+    """Return df in print order: Package Label ascending, ties in input order."""
+    order = np.argsort(df["Package Label"].to_numpy(dtype=str), kind="stable")
+    return df.iloc[order]
+
+
+def iter_all_labels(df, label_mode):
+    """
+    Yield labels for all rows in the DataFrame, sorted by UID.
     
     If a row has a "Label Override" value, that exact number of labels is generated.
     Otherwise, the label_mode determines the count (1 per package or 1 per case).
     """
-    all_labels = []
+    return _iter_sorted_labels(_sort_by_uid(df), label_mode)
+
+
+def generate_all_labels(df, label_mode):
+    """List version of iter_all_labels."""
+    return list(iter_all_labels(df, label_mode))
+
+
+def _iter_sorted_labels(df_sorted, label_mode):
+    """Yield labels for rows already in print order."""
+    row_count = len(df_sorted)
     
-    df_sorted = df.sort_values(["Package Label"], ascending=[True])
+    # Convert the numeric columns once; a missing override becomes the -1 sentinel
+    def numeric(name, default):
+        if name not in df_sorted.columns:
+            return np.full(row_count, default)
+        return pd.to_numeric(df_sorted[name], errors="coerce").fillna(default).to_numpy()
     
-    for idx, row in df_sorted.iterrows():
-        override = row.get("Label Override")
-        
-        if pd.notna(override) and int(override) > 0:
-            override_count = int(override)
-            created_date = row.get("Created At (Full)", "")
-            units_per_case = safe_numeric(row.get("Units_Per_Case_Num", 0))
+    overrides = numeric("Label Override", -1).astype(np.int64).tolist()
+    quantities = numeric("Quantity_Num", 0).tolist()
+    units_per_case_values = numeric("Units_Per_Case_Num", 0).tolist()
+    
+    for fields, override, quantity, units_per_case in zip(
+        _label_field_rows(df_sorted), overrides, quantities, units_per_case_values
+    ):
+        if override > 0:
             units_per_case_display = units_per_case if units_per_case > 0 else None
-            
-            for _ in range(override_count):
-                zpl = generate_label_zpl(
-                    product_name=row.get("Product Name", ""),
-                    brand=row.get("Brand", ""),
-                    product_clean=row.get("Product (Clean)", ""),
-                    batch_no=row.get("Batch No", ""),
-                    qty=units_per_case_display,
-                    package_label=row.get("Package Label", ""),
-                    category=row.get("Category", ""),
-                    created_date=created_date
-                )
-                all_labels.append(zpl)
-        elif pd.notna(override) and int(override) == 0:
+            yield from repeat(_generate_label_zpl_cached(units_per_case_display, *fields), override)
+        elif override == 0:
             continue
         else:
-            row_labels = generate_labels_for_row(row, label_mode)
-            all_labels.extend(row_labels)
+            yield from _labels_for_package(fields, quantity, units_per_case, label_mode)
+
+
+def write_labels(labels, out):
+    """
+    Write labels to a binary stream, newline-separated, and return the count.
     
-    return all_labels
+    Produces the same bytes as "\n".join(labels).encode() while labels
+    stream in from a generator, so no label list or joined string is held.
+    """
+    count = 0
+    for label in labels:
+        if count:
+            out.write(b"\n")
+        out.write(label.encode())
+        count += 1
+    return count
 
 
 def generate_filename(data, label_mode):
     """Generate a descriptive filename for the ZPL download."""
-    timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = datetime.now(TIMEZONE).strftime("%Y%m%d_%H%M%S")
     
-    brands = data["Brand"].dropna().unique()
+    brand_values = data["Brand"].to_numpy()
+    brands = pd.unique(brand_values[pd.notna(brand_values)])
     if len(brands) == 1:
         brand_part = str(brands[0]).replace(" ", "_")[:20]
     elif len(brands) <= 3:
@@ -764,14 +1064,126 @@ def generate_filename(data, label_mode):
 
 
 # =============================================================================
-# BROWSER PRINT INTEGRATION
+# CACHED VIEW HELPERS
 # =============================================================================
 
-def create_browser_print_launcher(zpl_data, label_count):
-    """Create an HTML component for copying ZPL to clipboard."""
-    b64_zpl = base64.b64encode(zpl_data.encode()).decode()
+# Processed frames kept per server; the least recently used are dropped beyond this
+_PROCESSED_STORE_SIZE = 8
+
+
+@st.cache_resource(show_spinner=False)
+def _processed_store():
+    """
+    Process-wide (lock, data_key -> processed DataFrame) pair.
+    
+    Returned by reference, so a large frame is not copied through
+    session_state on every rerun. Frames are shared between sessions and
+    must not be modified in place.
+    
+    The dict is kept in least-recently-used order: every store or lookup
+    moves its key to the end, and eviction removes from the front. A
+    session that is still rerunning keeps its frame; only one left idle
+    while _PROCESSED_STORE_SIZE other datasets are used can lose it.
+    """
+    return threading.Lock(), {}
+
+
+def store_processed_data(data_key, df):
+    """Keep df under data_key, evicting the least recently used frames past the store size."""
+    lock, store = _processed_store()
+    with lock:
+        store.pop(data_key, None)
+        store[data_key] = df
+        while len(store) > _PROCESSED_STORE_SIZE:
+            del store[next(iter(store))]
+
+
+def get_processed_data(data_key):
+    """Return the processed frame for data_key (marking it most recently used), or None."""
+    if data_key is None:
+        return None
+    lock, store = _processed_store()
+    with lock:
+        df = store.pop(data_key, None)
+        if df is not None:
+            store[data_key] = df
+    return df
+
+
+# These caches are shared by every session; bound them so old selections
+# and datasets dropped from the processed store are eventually evicted
+@st.cache_data(show_spinner=False, max_entries=256, ttl=3600)
+def _unique_sorted(_df, data_key, column, filters=(), _mask=None):
+    """
+    Sorted unique non-null values of a column, cached across reruns.
+    
+    _df and _mask are not hashed by Streamlit (leading underscore). data_key
+    identifies the processed dataset and filters must capture the selections
+    that produced _mask, so together they fully determine the result.
+    """
+    values = _df[column] if _mask is None else _df[column][_mask]
+    return sorted(values.dropna().unique())
+
+
+@st.cache_data(show_spinner=False, max_entries=2 * _PROCESSED_STORE_SIZE, ttl=3600)
+def _top_counts(_df, data_key, column, n=15):
+    """Most frequent values of a column for the overview charts, cached per dataset."""
+    return _df[column].value_counts().head(n)
+
+
+@st.cache_data(show_spinner=False, max_entries=_PROCESSED_STORE_SIZE, ttl=3600)
+def _date_counts(_df, data_key):
+    """Packages per Created Date for the overview chart, cached per dataset."""
+    return _df["Created Date"].value_counts().sort_index()
+
+
+@st.cache_data(show_spinner=False, max_entries=_PROCESSED_STORE_SIZE, ttl=3600)
+def _overview_metrics(_df, data_key):
+    """Headline numbers for the Data Overview tab, cached per dataset."""
+    return {
+        "packages": len(_df),
+        "brands": _df["Brand"].nunique(),
+        "vendors": _df["Vendor"].nunique(),
+        "quantity": int(_df["Quantity_Num"].sum()),
+        "with_case_data": int((_df["Units_Per_Case_Num"] > 0).sum()),
+    }
+
+
+def _view_digest(df):
+    """
+    Exact digest of a filtered view: which processed rows it holds, in
+    order, and their Label Override values.
+    
+    Streamlit only samples rows when hashing large frames, so a cache keyed
+    on the frame itself could miss an override edit.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(df.index.to_numpy(dtype=np.int64).tobytes())
+    if "Label Override" in df.columns:
+        digest.update(df["Label Override"].to_numpy(dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+# Every session shares this cache, so only a few full CSV copies are kept
+@st.cache_data(show_spinner=False, max_entries=4, ttl=3600)
+def _to_csv_bytes(_df, data_key, view_digest):
+    """
+    Serialize the filtered table for download; re-runs only when the view changes.
     
-    html_content = f'''
+    _df is not hashed; data_key and view_digest (from _view_digest) identify it.
+    """
+    csv_buffer = io.StringIO()
+    _df.to_csv(csv_buffer, index=False)
+    return csv_buffer.getvalue().encode()
+
+
+# =============================================================================
+# BROWSER PRINT INTEGRATION
+# =============================================================================
+
+# Clipboard launcher markup; only the label count and payload vary per render.
+# Literal braces for the JavaScript are doubled for str.format.
+_LAUNCHER_TEMPLATE = '''
     <div style="padding: 20px; border: 2px solid #4CAF50; border-radius: 10px; background-color: #f9f9f9;">
         <h3 style="color: #333; margin-top: 0;">🖨️ Ready to Print {label_count} Labels</h3>
         
@@ -836,7 +1248,19 @@ def create_browser_print_launcher(zpl_data, label_count):
         }}
     </script>
     '''
+
+
+def create_browser_print_launcher(zpl_data, label_count):
+    """
+    Create an HTML component for copying ZPL to clipboard.
+    
+    zpl_data may be str or already-encoded bytes.
+    """
+    if isinstance(zpl_data, str):
+        zpl_data = zpl_data.encode()
+    b64_zpl = base64.b64encode(zpl_data).decode()
     
+    html_content = _LAUNCHER_TEMPLATE.format(label_count=label_count, b64_zpl=b64_zpl)
     components.html(html_content, height=250)
 
 
@@ -876,19 +1300,30 @@ def main():
     process_disabled = not (packages_file and products_file)
     if st.sidebar.button("🚀 Process Data", type="primary", disabled=process_disabled):
         with st.spinner("Processing your data..."):
-            packages_df = load_csv(packages_file, "Packages")
-            products_df = load_csv(products_file, "Products")
-            
-            if packages_df is None or products_df is None:
-                st.error("Failed to load one or more CSV files")
-                st.stop()
+            new_data_key = upload_key(packages_file, products_file)
+            # Same files as an earlier run: reuse the stored merge (and mark it recently used)
+            processed_data = get_processed_data(new_data_key)
             
-            st.success(f"Files loaded: Packages ({len(packages_df):,} rows) | Products ({len(products_df):,} rows)")
-            
-            processed_data = merge_data_sources(packages_df, products_df)
+            if processed_data is None:
+                packages_df = load_csv(packages_file, "Packages", usecols=PACKAGES_COLUMNS)
+                products_df = load_csv(products_file, "Products", usecols=PRODUCTS_COLUMNS)
+                
+                if packages_df is None or products_df is None:
+                    st.error("Failed to load one or more CSV files")
+                    st.stop()
+                
+                st.success(f"Files loaded: Packages ({len(packages_df):,} rows) | Products ({len(products_df):,} rows)")
+                
+                processed_data = merge_data_sources(packages_df, products_df)
+                _extract_brand_cached.cache_clear()
+                if processed_data is not None:
+                    store_processed_data(new_data_key, processed_data)
             
             if processed_data is not None:
-                st.session_state.processed_data = processed_data
+                st.session_state.data_key = new_data_key
+                st.session_state.label_overrides = {}
+                st.session_state.override_epoch += 1
+                st.session_state.available_dates = np.sort(processed_data["Created Date"].dropna().unique())
                 # Reset status filter to allow new defaults
                 if "status_filter_selection" in st.session_state:
                     del st.session_state["status_filter_selection"]
@@ -902,15 +1337,21 @@ def main():
         st.markdown(f"**Current week:** {current_week} ({current_icon})")
         st.markdown("---")
         st.markdown("**Symbol Rotation:**")
-        for i in range(1, 19):
-            icon_name = WEEK_ICONS[i]["name"]
+        for i, icon_name in enumerate(WEEK_ICON_NAMES, 1):
             marker = " ← current" if i == current_week else ""
             st.markdown(f"{i}. {icon_name}{marker}")
     
     # Changelog
     with st.sidebar.expander("📋 Version History & Changelog"):
         st.markdown("""
-        **v1.2.0** (Current)
+        **v1.3.0** (Current)
+        - "Apply filters" button for Brand/Vendor
+        - Paged package table (200 rows per page)
+        - Overrides kept across pages and filter changes
+        - Empty filters also show packages missing status, vendor or date
+        - Faster processing and label generation
+        
+        **v1.2.0** (2025-02-21)
         - Package Search for quick single-label printing
         - Single-click Generate & Download ZPL
         - Cleaned up bottom section layout
@@ -945,8 +1386,9 @@ def main():
     # MAIN CONTENT
     # -------------------------------------------------------------------------
     
-    if st.session_state.processed_data is not None:
-        processed_df = st.session_state.processed_data
+    data_key = st.session_state.data_key
+    processed_df = get_processed_data(data_key)
+    if processed_df is not None:
         
         tab1, tab2 = st.tabs(["🎯 Generate Labels", "📊 Data Overview"])
         
@@ -962,11 +1404,12 @@ def main():
             with col1:
                 st.subheader("📅 Filter by Created Date")
                 
-                available_dates = sorted(processed_df["Created Date"].dropna().unique())
+                # Sorted once when the data was processed
+                available_dates = st.session_state.available_dates
                 
-                if available_dates:
-                    min_date = min(available_dates)
-                    max_date = max(available_dates)
+                if len(available_dates):
+                    min_date = available_dates[0]
+                    max_date = available_dates[-1]
                     
                     st.markdown("**Quick Select:**")
                     qcol1, qcol2, qcol3, qcol4 = st.columns(4)
@@ -998,16 +1441,16 @@ def main():
                         selection = st.session_state.get("date_selection", "all")
                         
                         if selection == "today":
-                            selected_dates = [d for d in available_dates if d == today]
+                            selected_dates = dates_in_range(available_dates, today, today)
                             st.info(f"📅 Showing packages from today ({today.strftime('%m/%d/%Y')})")
                         elif selection == "yesterday":
-                            selected_dates = [d for d in available_dates if d == yesterday]
+                            selected_dates = dates_in_range(available_dates, yesterday, yesterday)
                             st.info(f"⏪ Showing packages from yesterday ({yesterday.strftime('%m/%d/%Y')})")
                         elif selection == "this_week":
-                            selected_dates = [d for d in available_dates if d >= week_start]
+                            selected_dates = dates_in_range(available_dates, week_start)
                             st.info(f"📆 Showing packages from this week ({week_start.strftime('%m/%d/%Y')} - {today.strftime('%m/%d/%Y')})")
                         else:
-                            selected_dates = list(available_dates)
+                            selected_dates = []  # No date filter
                             st.info(f"🔄 Showing all dates ({len(available_dates)} dates)")
                     
                     elif date_filter_type == "Date range":
@@ -1018,7 +1461,7 @@ def main():
                             max_value=max_date
                         )
                         if isinstance(date_range, tuple) and len(date_range) == 2:
-                            selected_dates = [d for d in available_dates if date_range[0] <= d <= date_range[1]]
+                            selected_dates = dates_in_range(available_dates, date_range[0], date_range[1])
                         else:
                             selected_dates = list(available_dates)
                     
@@ -1035,11 +1478,12 @@ def main():
             
             # --- BRAND, VENDOR, STATUS FILTERS (Cascading from Date) ---
             with col2:
-                # First, apply date filter to get the base dataset for other filters
+                # Filters cascade as cumulative boolean masks over processed_df;
+                # the same masks narrow the option lists and the final selection.
+                # An empty selection means "all" and skips that filter entirely.
+                date_mask = np.ones(len(processed_df), dtype=bool)
                 if selected_dates:
-                    date_filtered_df = processed_df[processed_df["Created Date"].isin(selected_dates)]
-                else:
-                    date_filtered_df = processed_df
+                    date_mask = processed_df["Created Date"].isin(selected_dates).to_numpy()
                 
                 # ============================================================
                 # STATUS FILTER — v1.1.7 FIX
@@ -1047,7 +1491,9 @@ def main():
                 # NO default= parameter is used — that caused the conflict.
                 # ============================================================
                 st.subheader("📊 Status")
-                available_statuses = sorted(date_filtered_df["Status"].dropna().unique())
+                available_statuses = _unique_sorted(
+                    processed_df, data_key, "Status", (tuple(selected_dates),), _mask=date_mask
+                )
                 
                 if available_statuses:
                     status_key = "status_filter_selection"
@@ -1070,65 +1516,66 @@ def main():
                         key=status_key,
                         help="Defaults to 'Active' packages"
                     )
-                    if not selected_statuses:
-                        selected_statuses = list(available_statuses)  # If cleared, show all
                 else:
                     selected_statuses = []
                 
                 # Apply status filter
-                status_filtered_df = date_filtered_df[date_filtered_df["Status"].isin(selected_statuses)] if selected_statuses else date_filtered_df
+                status_mask = date_mask
+                if selected_statuses:
+                    status_mask = date_mask & processed_df["Status"].isin(set(selected_statuses)).to_numpy()
                 
-                # Brand filter (cascaded from date + status)
-                st.subheader("🏷️ Brand")
-                available_brands = sorted(status_filtered_df["Brand"].dropna().unique())
-                
-                if available_brands:
-                    selected_brands = st.multiselect(
-                        "Filter by brand:",
-                        options=available_brands,
-                        default=[],
-                        placeholder="All brands (click to filter)"
+                # Brand and vendor picks are batched in a form: toggling several
+                # entries costs one rerun on Apply instead of one per click
+                with st.form("brand_vendor_filters"):
+                    # Brand filter (cascaded from date + status)
+                    st.subheader("🏷️ Brand")
+                    available_brands = _unique_sorted(
+                        processed_df, data_key, "Brand",
+                        (tuple(selected_dates), tuple(selected_statuses)), _mask=status_mask
                     )
-                    if not selected_brands:
-                        selected_brands = list(available_brands)
-                else:
-                    selected_brands = []
-                    st.warning("No brands found")
-                
-                # Apply brand filter to get available vendors
-                brand_filtered_df = status_filtered_df[status_filtered_df["Brand"].isin(selected_brands)] if selected_brands else status_filtered_df
-                
-                # Vendor filter (cascaded from date + status + brand)
-                st.subheader("🏢 Vendor")
-                available_vendors = sorted(brand_filtered_df["Vendor"].dropna().unique())
-                
-                if available_vendors:
-                    selected_vendors = st.multiselect(
-                        "Filter by vendor:",
-                        options=available_vendors,
-                        default=[],
-                        placeholder="All vendors (click to filter)"
+                    
+                    if available_brands:
+                        selected_brands = st.multiselect(
+                            "Filter by brand:",
+                            options=available_brands,
+                            default=[],
+                            placeholder="All brands (click to filter)"
+                        )
+                    else:
+                        selected_brands = []
+                        st.warning("No brands found")
+                    
+                    # Apply brand filter to get available vendors
+                    brand_mask = status_mask
+                    if selected_brands:
+                        brand_mask = status_mask & processed_df["Brand"].isin(set(selected_brands)).to_numpy()
+                    
+                    # Vendor filter (cascaded from date + status + brand)
+                    st.subheader("🏢 Vendor")
+                    available_vendors = _unique_sorted(
+                        processed_df, data_key, "Vendor",
+                        (tuple(selected_dates), tuple(selected_statuses), tuple(selected_brands)),
+                        _mask=brand_mask
                     )
-                    if not selected_vendors:
-                        selected_vendors = list(available_vendors)
-                else:
-                    selected_vendors = []
-                    st.info("No vendor data")
+                    
+                    if available_vendors:
+                        selected_vendors = st.multiselect(
+                            "Filter by vendor:",
+                            options=available_vendors,
+                            default=[],
+                            placeholder="All vendors (click to filter)"
+                        )
+                    else:
+                        selected_vendors = []
+                        st.info("No vendor data")
+                    
+                    st.form_submit_button("Apply filters", use_container_width=True)
             
             # --- APPLY FILTERS ---
-            filtered_df = processed_df.copy()
-            
-            if selected_dates:
-                filtered_df = filtered_df[filtered_df["Created Date"].isin(selected_dates)]
-            
-            if selected_brands:
-                filtered_df = filtered_df[filtered_df["Brand"].isin(selected_brands)]
-            
+            filter_mask = brand_mask
             if selected_vendors:
-                filtered_df = filtered_df[filtered_df["Vendor"].isin(selected_vendors)]
-            
-            if selected_statuses:
-                filtered_df = filtered_df[filtered_df["Status"].isin(selected_statuses)]
+                filter_mask = brand_mask & processed_df["Vendor"].isin(set(selected_vendors)).to_numpy()
+            filtered_df = processed_df[filter_mask]
             
             st.markdown("---")
             
@@ -1164,8 +1611,10 @@ def main():
             st.subheader(f"📦 Filtered Packages ({len(filtered_df):,} records)")
             
             if not filtered_df.empty:
-                filtered_df = filtered_df.copy()
-                filtered_df.insert(0, "Label Override", None)
+                # Overrides live in session state keyed by the processed frame's row
+                # index (Package Label can be blank), so they survive paging and filters
+                label_overrides = st.session_state["label_overrides"]
+                filtered_df.insert(0, "Label Override", np.nan)
                 
                 display_cols = [
                     "Label Override", "Case Labels Needed", "Brand", "Product (Clean)", 
@@ -1193,17 +1642,57 @@ def main():
                 
                 st.caption("💡 **Tip:** Enter a number in 'Override' to print that many labels for a specific product")
                 
-                edited_df = st.data_editor(
-                    filtered_df[display_cols],
+                # Only one page of rows is sent to the browser per rerun
+                page_count = math.ceil(len(filtered_df) / EDITOR_PAGE_SIZE)
+                page = 1
+                if page_count > 1:
+                    page = st.number_input(
+                        f"Page (of {page_count}, {EDITOR_PAGE_SIZE} rows each)",
+                        min_value=1,
+                        max_value=page_count,
+                        value=1,
+                        step=1
+                    )
+                page_df = filtered_df.iloc[(page - 1) * EDITOR_PAGE_SIZE:page * EDITOR_PAGE_SIZE]
+                
+                # Streamlit derives the editor's identity from its data, so the data
+                # must not change while the user edits this page or pending edits
+                # are dropped. It shows the overrides as of when the page was opened;
+                # edits since then are read back from the widget state below.
+                page_index = page_df.index.to_numpy(dtype=np.int64)
+                page_id = hashlib.blake2b(page_index.tobytes(), digest_size=8).hexdigest()
+                editor_key = f"override_editor_{st.session_state['override_epoch']}_{data_key}_{page_id}"
+                snapshot = st.session_state.get("override_snapshot")
+                if snapshot is None or snapshot[0] != editor_key:
+                    snapshot = st.session_state["override_snapshot"] = (
+                        editor_key,
+                        {i: label_overrides[i] for i in page_index.tolist() if i in label_overrides}
+                    )
+                editor_df = page_df[display_cols]
+                editor_df["Label Override"] = page_df.index.map(snapshot[1]).to_numpy(dtype=np.float64)
+                
+                st.data_editor(
+                    editor_df,
                     column_config=column_config,
                     use_container_width=True,
                     height=400,
                     num_rows="fixed",
                     hide_index=True,
-                    disabled=[c for c in display_cols if c != "Label Override"]
+                    disabled=[c for c in display_cols if c != "Label Override"],
+                    key=editor_key
                 )
                 
-                filtered_df["Label Override"] = edited_df["Label Override"].values
+                for position, changes in st.session_state[editor_key]["edited_rows"].items():
+                    if "Label Override" not in changes:
+                        continue
+                    row_index = int(page_index[int(position)])
+                    override = changes["Label Override"]
+                    if override is None or pd.isna(override):
+                        label_overrides.pop(row_index, None)
+                    else:
+                        label_overrides[row_index] = override
+                # float64 once here, so missing overrides are NaN for every consumer below
+                filtered_df["Label Override"] = filtered_df.index.map(label_overrides).to_numpy(dtype=np.float64)
                 
                 # =============================================================
                 # LABEL GENERATION — Compact single-click layout
@@ -1222,24 +1711,20 @@ def main():
                     label_mode_key = "package" if "Package" in label_mode else "case"
                 
                 # Calculate total labels (accounting for overrides)
-                override_labels = 0
-                override_count = 0
-                non_override_df = filtered_df.copy()
-                
-                for idx, row in filtered_df.iterrows():
-                    override = row.get("Label Override")
-                    if pd.notna(override):
-                        override_labels += int(override)
-                        override_count += 1
-                        non_override_df = non_override_df.drop(idx)
+                overrides = filtered_df["Label Override"].to_numpy(dtype=np.float64)
+                has_override = ~np.isnan(overrides)
+                override_labels = int(np.nansum(overrides))
+                override_count = int(has_override.sum())
+                non_override_df = filtered_df[~has_override]
                 
                 if label_mode_key == "package":
                     mode_labels = len(non_override_df)
                 else:
-                    mode_labels = int(non_override_df["Case Labels Needed"].sum()) if not non_override_df.empty else 0
-                    no_case_data = non_override_df[non_override_df["Units_Per_Case_Num"] == 0]
-                    if len(no_case_data) > 0:
-                        st.warning(f"⚠️ {len(no_case_data)} packages missing Units Per Case")
+                    # Case Labels Needed is int64 from merge_data_sources, so both are single C loops
+                    mode_labels = int(non_override_df["Case Labels Needed"].to_numpy().sum())
+                    missing_case_data = int((non_override_df["Units_Per_Case_Num"].to_numpy() == 0).sum())
+                    if missing_case_data:
+                        st.warning(f"⚠️ {missing_case_data} packages missing Units Per Case")
                 
                 total_labels = override_labels + mode_labels
                 
@@ -1248,8 +1733,8 @@ def main():
                     st.markdown(f"**Labels:** {total_labels:,}")
                     st.markdown(f"**Size:** 4\" x 2\" at {DPI} DPI")
                     if not filtered_df.empty:
-                        sample_date = filtered_df["Created At (Full)"].iloc[0]
-                        sample_week = get_week_number(sample_date)
+                        # Week Num is precomputed by merge_data_sources; the labels use it too
+                        sample_week = int(filtered_df["Week Num"].iat[0])
                         sample_icon = get_week_icon_name(sample_week)
                         st.markdown(f"**Symbol:** {sample_icon} (wk {sample_week})")
                 
@@ -1259,18 +1744,21 @@ def main():
                         if st.button(f"🖨️ Generate & Download {total_labels:,} Labels", type="primary", use_container_width=True):
                             try:
                                 with st.spinner("Generating ZPL..."):
-                                    labels = generate_all_labels(filtered_df, label_mode_key)
+                                    zpl_out = io.BytesIO()
+                                    label_count = write_labels(
+                                        iter_all_labels(filtered_df, label_mode_key), zpl_out
+                                    )
                                     
-                                    if not labels:
+                                    if not label_count:
                                         st.error("No labels were generated")
                                     else:
-                                        zpl_content = "\n".join(labels)
                                         filename = generate_filename(filtered_df, label_mode_key)
                                         
-                                        st.session_state["zpl_content"] = zpl_content
+                                        # getvalue() hands over the buffer without a second full copy
+                                        st.session_state["zpl_content"] = zpl_out.getvalue()
                                         st.session_state["zpl_filename"] = filename
-                                        st.session_state["label_count"] = len(labels)
-                                        st.success(f"✅ Generated {len(labels):,} labels!")
+                                        st.session_state["label_count"] = label_count
+                                        st.success(f"✅ Generated {label_count:,} labels!")
                             except Exception as e:
                                 st.error(f"Error: {str(e)}")
                     else:
@@ -1304,7 +1792,9 @@ def main():
                         st.markdown("**👀 Preview Sample Label**")
                         if st.button("Preview ZPL Code", use_container_width=True):
                             if len(filtered_df) > 0:
-                                sample_row = filtered_df.iloc[0]
+                                # Plain dict of the first row; avoids building a Series
+                                first_row = next(filtered_df.itertuples(index=False, name=None))
+                                sample_row = dict(zip(filtered_df.columns, first_row))
                                 sample_labels = generate_labels_for_row(sample_row, label_mode_key)
                                 if sample_labels:
                                     st.code(sample_labels[0], language="text")
@@ -1313,12 +1803,10 @@ def main():
                     
                     with more_col2:
                         st.markdown("**📄 Export Filtered Data**")
-                        csv_buffer = io.StringIO()
-                        filtered_df.to_csv(csv_buffer, index=False)
                         st.download_button(
                             label="Download CSV",
-                            data=csv_buffer.getvalue(),
-                            file_name=f"dc_packages_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                            data=_to_csv_bytes(filtered_df, data_key, _view_digest(filtered_df)),
+                            file_name=f"dc_packages_{datetime.now(TIMEZONE).strftime('%Y%m%d_%H%M%S')}.csv",
                             mime="text/csv",
                             use_container_width=True
                         )
@@ -1331,35 +1819,32 @@ def main():
         with tab2:
             st.header("📊 Data Overview")
             
+            metrics = _overview_metrics(processed_df, data_key)
             metric_col1, metric_col2, metric_col3, metric_col4, metric_col5 = st.columns(5)
             
             with metric_col1:
-                st.metric("Total Packages", len(processed_df))
+                st.metric("Total Packages", metrics["packages"])
             with metric_col2:
-                st.metric("Unique Brands", len(processed_df["Brand"].dropna().unique()))
+                st.metric("Unique Brands", metrics["brands"])
             with metric_col3:
-                st.metric("Unique Vendors", len(processed_df["Vendor"].dropna().unique()))
+                st.metric("Unique Vendors", metrics["vendors"])
             with metric_col4:
-                st.metric("Total Quantity", f"{int(processed_df['Quantity_Num'].sum()):,}")
+                st.metric("Total Quantity", f"{metrics['quantity']:,}")
             with metric_col5:
-                has_case_data = (processed_df["Units_Per_Case_Num"] > 0).sum()
-                st.metric("With Case Data", f"{has_case_data:,}")
+                st.metric("With Case Data", f"{metrics['with_case_data']:,}")
             
             chart_col1, chart_col2 = st.columns(2)
             
             with chart_col1:
                 st.subheader("📈 Brand Breakdown")
-                brand_counts = processed_df["Brand"].value_counts().head(15)
-                st.bar_chart(brand_counts)
+                st.bar_chart(_top_counts(processed_df, data_key, "Brand"))
             
             with chart_col2:
                 st.subheader("🏢 Vendor Breakdown")
-                vendor_counts = processed_df["Vendor"].value_counts().head(15)
-                st.bar_chart(vendor_counts)
+                st.bar_chart(_top_counts(processed_df, data_key, "Vendor"))
             
             st.subheader("📅 Packages by Date")
-            date_counts = processed_df["Created Date"].value_counts().sort_index()
-            st.bar_chart(date_counts)
+            st.bar_chart(_date_counts(processed_df, data_key))
             
             st.subheader("🔍 Complete Dataset")
             st.dataframe(processed_df, use_container_width=True)